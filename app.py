@@ -1,14 +1,15 @@
 from fastapi import APIRouter, FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import logging
+import os
 
 # Импортируем роутер для номерных знаков
 from src.api.license_plate import license_plate_router
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO)
+# Настройка логирования (в продакшене можно поднять уровень, например LOG_LEVEL=WARNING)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -16,7 +17,8 @@ app = FastAPI(
     description="API для работы с номерными знаками автомобилей",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -57,8 +59,8 @@ async def root():
 # Обработчик ошибок валидации
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    logger.error(f"Validation error for {request.url}: {exc.errors()}")
-    return JSONResponse(
+    logger.error("Validation error for %s: %s", request.url, exc.errors())
+    return ORJSONResponse(
         status_code=422,
         content={
             "error": "Ошибка валидации данных",
@@ -69,8 +71,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 # Обработчик общих HTTP ошибок
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unexpected error for {request.url}: {str(exc)}")
-    return JSONResponse(
+    logger.error("Unexpected error for %s: %s", request.url, exc)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Внутренняя ошибка сервера",
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field, validator
-from typing import Optional, Literal
+from pydantic import BaseModel, Field, StringConstraints
+from array import array
+from functools import lru_cache
+from typing import Annotated, Optional, Literal
 import re
 import logging
 
@@ -10,13 +12,12 @@ license_plate_router = APIRouter()
 
 # Схемы для номерных знаков
 class LicensePlateRequest(BaseModel):
-    plate_number: str = Field(..., description="Номерной знак автомобиля", min_length=1, max_length=20)
-    
-    @validator('plate_number')
-    def validate_plate_number(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Номерной знак не может быть пустым')
-        return v.strip()
+    # Пробелы по краям обрезаются до проверки длины, поэтому пустой номер отклоняется схемой
+    plate_number: Annotated[
+        str,
+        StringConstraints(strip_whitespace=True, min_length=1, max_length=20),
+        Field(description="Номерной знак автомобиля"),
+    ]
 
 class LicensePlateResponse(BaseModel):
     plate_number: str = Field(description="Обработанный номерной знак")
@@ -30,8 +31,59 @@ class ValidationStats(BaseModel):
     valid_plates: int
     invalid_plates: int
 
-# Статистика (в реальном проекте лучше использовать базу данных или Redis)
-validation_stats = {"total": 0, "valid": 0, "invalid": 0}
+# Статистика (в реальном проекте лучше использовать базу данных или Redis).
+# Счетчики невалидных и валидных номеров индексируются значением is_valid,
+# общее количество считается как их сумма
+validation_stats = array("Q", [0, 0])
+
+# Паттерны для разных типов номеров, объединенные в одно выражение.
+# Тип номера определяется по имени сработавшей группы, поэтому порядок
+# альтернатив важен: при неоднозначности побеждает первая (такси раньше прицепа).
+# Код региона захватывается вложенной группой <тип>_region (у транзитных его нет).
+# Якорей нет: номер целиком проверяется через fullmatch
+_PLATE_RE = re.compile(
+    r"(?P<standard>[АВЕКМНОРСТУХ]\d{3}[АВЕКМНОРСТУХ]{2}(?P<standard_region>\d{2,3}))"  # А123ВС77
+    r"|(?P<taxi>[АВЕКМНОРСТУХ]{2}\d{3}(?P<taxi_region>\d{2,3}))"  # АВ12377
+    r"|(?P<trailer>[АВЕКМНОРСТУХ]{2}\d{4}(?P<trailer_region>\d{2,3}))"  # АВ123477
+    r"|(?P<motorcycle>\d{4}[АВЕКМНОРСТУХ]{2}(?P<motorcycle_region>\d{2,3}))"  # 1234АВ77
+    r"|(?P<transit>Т\d{5}[АВЕКМНОРСТУХ])"  # Т12345А
+    r"|(?P<diplomatic>\d{3,4}Д(?P<diplomatic_region>\d{2,3}))",  # 123Д77
+    re.ASCII  # \d - только цифры 0-9, как и в _DIGITS
+)
+
+# Номер группы типа (match.lastindex) -> (тип номера, номер группы региона, сообщение)
+_PLATE_GROUPS = {
+    index: (
+        plate_type,
+        _PLATE_RE.groupindex.get(f"{plate_type}_region"),
+        f"Номерной знак корректен (тип: {plate_type})"
+    )
+    for plate_type, index in _PLATE_RE.groupindex.items()
+    if not plate_type.endswith("_region")
+}
+
+# Результат _validate_normalized для номера, не подходящего ни под один формат
+_INVALID_FIELDS = (None, None, "Некорректный формат номерного знака")
+
+# Допустимые длины номера после нормализации: от 123Д77 до А123ВС777
+_PLATE_LENGTHS = range(6, 10)
+
+# Буквы, допустимые на номерных знаках (совпадают по начертанию с латинскими), и цифры
+_LETTERS = "АВЕКМНОРСТУХ"
+_DIGITS = "0123456789"
+
+# Все буквенные классы в _PLATE_RE должны совпадать с _LETTERS
+assert set(re.findall(r"\[([^\]]+)\]", _PLATE_RE.pattern)) == {_LETTERS}
+
+# Символы, с которых может начинаться номер любого типа
+_FIRST_CHARS = frozenset(_LETTERS + _DIGITS)
+
+# Таблица для удаления пробелов и дефисов за один проход
+_NORMALIZE_TABLE = str.maketrans("", "", " -")
+
+def _normalize_plate(plate_number: str) -> str:
+    """Приведение номера к верхнему регистру без пробелов и дефисов"""
+    return plate_number.upper().translate(_NORMALIZE_TABLE)
 
 def validate_russian_plate(plate_number: str) -> dict:
     """
@@ -44,46 +96,52 @@ def validate_russian_plate(plate_number: str) -> dict:
     - Мотоциклы: 1234АВ77, 1234АВ777
     - Транзитные: Т12345А, Т123456А
     - Дипломатические: 123Д123, 1234Д123
+    
+    В поле plate_number результата возвращается нормализованный номер
     """
-    plate_number = plate_number.upper().replace(" ", "").replace("-", "")
-    
-    # Паттерны для разных типов номеров
-    patterns = {
-        "standard": r"^[АВЕКМНОРСТУХ]\d{3}[АВЕКМНОРСТУХ]{2}\d{2,3}$",  # А123ВС77
-        "taxi": r"^[АВЕКМНОРСТУХ]{2}\d{3}\d{2,3}$",  # АВ12377
-        "trailer": r"^[АВЕКМНОРСТУХ]{2}\d{4}\d{2,3}$",  # АВ123477
-        "motorcycle": r"^\d{4}[АВЕКМНОРСТУХ]{2}\d{2,3}$",  # 1234АВ77
-        "transit": r"^Т\d{5}[АВЕКМНОРСТУХ]$",  # Т12345А
-        "diplomatic": r"^\d{3,4}Д\d{2,3}$",  # 123Д77
-    }
-    
-    for plate_type, pattern in patterns.items():
-        if re.match(pattern, plate_number):
-            # Извлекаем код региона
-            region_code = None
-            if plate_type in ["standard", "taxi", "trailer", "motorcycle"]:
-                # Для обычных номеров регион в конце
-                if plate_type == "standard":
-                    region_code = plate_number[-2:] if len(plate_number) == 8 else plate_number[-3:]
-                else:
-                    region_code = plate_number[-2:] if len(plate_number) <= 8 else plate_number[-3:]
-            elif plate_type == "diplomatic":
-                # Для дипломатических номеров регион после Д
-                region_code = plate_number.split('Д')[1]
-            
-            return {
-                "is_valid": True,
-                "plate_type": plate_type,
-                "region_code": region_code,
-                "message": f"Номерной знак корректен (тип: {plate_type})"
-            }
-    
-    return {
-        "is_valid": False,
-        "plate_type": None,
-        "region_code": None,
-        "message": "Некорректный формат номерного знака"
-    }
+    return _plate_response(plate_number).model_dump()
+
+def _plate_response(plate_number: str) -> LicensePlateResponse:
+    """Ответ с результатом валидации номера; единственное место, где собираются его поля"""
+    plate_number = _normalize_plate(plate_number)
+    plate_type, region_code, message = _validate_normalized(plate_number)
+    
+    return LicensePlateResponse.model_construct(
+        plate_number=plate_number,
+        is_valid=plate_type is not None,
+        plate_type=plate_type,
+        region_code=region_code,
+        message=message
+    )
+
+@lru_cache(maxsize=4096)
+def _validate_normalized(plate_number: str) -> tuple[Optional[str], Optional[str], str]:
+    """
+    Валидация номера, уже приведенного к виду из _normalize_plate
+    
+    Возвращает (тип номера, код региона, сообщение); тип None означает некорректный номер.
+    Результат кэшируется и разделяется между запросами, поэтому это неизменяемый кортеж
+    """
+    # Строки неподходящей длины или с недопустимым первым символом
+    # отбрасываем без запуска регулярного выражения
+    if len(plate_number) not in _PLATE_LENGTHS or plate_number[0] not in _FIRST_CHARS:
+        return _INVALID_FIELDS
+    
+    match = _PLATE_RE.fullmatch(plate_number)
+    if match is None:
+        return _INVALID_FIELDS
+    
+    plate_type, region_group, message = _PLATE_GROUPS[match.lastindex]
+    return plate_type, match[region_group] if region_group else None, message
+
+def _validate_batch(plate_numbers: list[str]) -> list[LicensePlateResponse]:
+    """
+    Валидация списка номеров
+    
+    Каждый номер проходит тот же путь, что и одиночный: предварительная
+    проверка длины и первого символа, кэш и сопоставление с _PLATE_RE
+    """
+    return [_plate_response(plate_number) for plate_number in plate_numbers]
 
 @license_plate_router.post("/validate", response_model=LicensePlateResponse)
 async def validate_license_plate(request: LicensePlateRequest):
@@ -92,27 +150,15 @@ async def validate_license_plate(request: LicensePlateRequest):
     
     Принимает JSON с номерным знаком и возвращает результат валидации
     """
-    try:
-        # Валидируем номер
-        validation_result = validate_russian_plate(request.plate_number)
-        
-        # Обновляем статистику
-        validation_stats["total"] += 1
-        if validation_result["is_valid"]:
-            validation_stats["valid"] += 1
-        else:
-            validation_stats["invalid"] += 1
-        
-        logger.info(f"Validated plate: {request.plate_number}, result: {validation_result['is_valid']}")
-        
-        return LicensePlateResponse(
-            plate_number=request.plate_number.upper().replace(" ", "").replace("-", ""),
-            **validation_result
-        )
-    
-    except Exception as e:
-        logger.error(f"Error validating plate {request.plate_number}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Ошибка при обработке номерного знака")
+    # Валидируем номер
+    result = _plate_response(request.plate_number)
+    
+    # Обновляем статистику
+    validation_stats[result.is_valid] += 1
+    
+    logger.info("Validated plate: %s, result: %s", request.plate_number, result.is_valid)
+    
+    return result
 
 @license_plate_router.get("/{plate_number}", response_model=LicensePlateResponse)
 async def get_license_plate_info(
@@ -126,26 +172,14 @@ async def get_license_plate_info(
     if not plate_number or not plate_number.strip():
         raise HTTPException(status_code=400, detail="Номерной знак не может быть пустым")
     
-    try:
-        validation_result = validate_russian_plate(plate_number)
-        
-        # Обновляем статистику
-        validation_stats["total"] += 1
-        if validation_result["is_valid"]:
-            validation_stats["valid"] += 1
-        else:
-            validation_stats["invalid"] += 1
-        
-        logger.info(f"Validated plate: {plate_number}, result: {validation_result['is_valid']}")
-        
-        return LicensePlateResponse(
-            plate_number=plate_number.upper().replace(" ", "").replace("-", ""),
-            **validation_result
-        )
-    
-    except Exception as e:
-        logger.error(f"Error validating plate {plate_number}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Ошибка при обработке номерного знака")
+    result = _plate_response(plate_number)
+    
+    # Обновляем статистику
+    validation_stats[result.is_valid] += 1
+    
+    logger.info("Validated plate: %s, result: %s", plate_number, result.is_valid)
+    
+    return result
 
 @license_plate_router.get("/", response_model=list[LicensePlateResponse])
 async def validate_multiple_plates(
@@ -164,29 +198,11 @@ async def validate_multiple_plates(
     if len(plate_list) > 10:
         raise HTTPException(status_code=400, detail="Максимум 10 номерных знаков за раз")
     
-    results = []
-    for plate in plate_list:
-        try:
-            validation_result = validate_russian_plate(plate)
-            
-            # Обновляем статистику
-            validation_stats["total"] += 1
-            if validation_result["is_valid"]:
-                validation_stats["valid"] += 1
-            else:
-                validation_stats["invalid"] += 1
-            
-            results.append(LicensePlateResponse(
-                plate_number=plate.upper().replace(" ", "").replace("-", ""),
-                **validation_result
-            ))
-        except Exception as e:
-            logger.error(f"Error validating plate {plate}: {str(e)}")
-            results.append(LicensePlateResponse(
-                plate_number=plate,
-                is_valid=False,
-                message=f"Ошибка при обработке: {str(e)}"
-            ))
+    results = _validate_batch(plate_list)
+    
+    # Обновляем статистику
+    for result in results:
+        validation_stats[result.is_valid] += 1
     
     return results
 
@@ -195,8 +211,9 @@ async def get_validation_stats():
     """
     Получение статистики валидации номерных знаков
     """
+    invalid_plates, valid_plates = validation_stats
     return ValidationStats(
-        total_validated=validation_stats["total"],
-        valid_plates=validation_stats["valid"],
-        invalid_plates=validation_stats["invalid"]
+        total_validated=invalid_plates + valid_plates,
+        valid_plates=valid_plates,
+        invalid_plates=invalid_plates
     )
\ No newline at end of file